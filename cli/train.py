@@ -1,5 +1,7 @@
 import argparse
 import collections
+import concurrent.futures
+import heapq
 import os
 import pickle
 import re
@@ -28,7 +30,7 @@ def _last_n_checkpoints(path, n, fallback_to_epoch=True):
                 sort_key = int(m.group(1))
                 entries.append((sort_key, m.group(0)))
 
-        return [os.path.join(path, x[1]) for x in sorted(entries, reverse=True)[:n]]
+        return [os.path.join(path, x[1]) for x in heapq.nlargest(n, entries)]
 
     checkpoints = _list(re.compile(r'checkpoint_\d+_(\d+)\.pt'))
     if len(checkpoints) == 0 and fallback_to_epoch:
@@ -73,12 +75,18 @@ class TrainActivity(StatefulActivity):
 
         self.state.save_interval_updates = int(argv_valueof(extra_argv, '--save-interval-updates'))
 
+        # each validation run writes its own event file, so parsed losses can be cached across polls
+        self._event_loss_cache = {}
+
     def _training_should_stop(self, threshold=0.0001):
         def _loss_iterator(_events, limit):
             count = 0
             # the first validation event written (last in list) has no 'best_loss'
             for e in _events[:-1]:
-                step, loss = _get_loss(e)
+                if e in self._event_loss_cache:
+                    step, loss = self._event_loss_cache[e]
+                else:
+                    step, loss = self._event_loss_cache[e] = _get_loss(e)
                 if step % self.state.save_interval_updates == 0:
                     yield loss
 
@@ -194,42 +202,56 @@ class TrainActivity(StatefulActivity):
             decode_lengths = pickle.load(f)
 
         # Average checkpoints
+        def _load(filename):
+            return torch.load(filename,
+                              map_location=lambda s, _: torch.serialization.default_restore_location(s, 'cpu'))
+
         params_dict = collections.OrderedDict()
         params_keys = None
         avg_state = None
 
-        for f in checkpoints:
-            state = torch.load(f, map_location=lambda s, _: torch.serialization.default_restore_location(s, 'cpu'))
-            # Copies over the settings from the first checkpoint
-            if avg_state is None:
-                avg_state = state
-
-            model_params = state['model']
-
-            model_params_keys = list(model_params.keys())
-            if params_keys is None:
-                params_keys = model_params_keys
-            elif params_keys != model_params_keys:
-                raise KeyError(
-                    'For checkpoint {}, expected list of params: {}, '
-                    'but found: {}'.format(f, params_keys, model_params_keys)
-                )
-
-            for k in params_keys:
-                if k not in params_dict:
-                    params_dict[k] = []
-                p = model_params[k]
-                if isinstance(p, torch.HalfTensor):
-                    p = p.float()
-                params_dict[k].append(p)
+        # a single background thread reads the next checkpoint from disk while the current one is accumulated
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        try:
+            future = executor.submit(_load, checkpoints[0])
+
+            for i, f in enumerate(checkpoints):
+                state = future.result()
+                if i + 1 < len(checkpoints):
+                    future = executor.submit(_load, checkpoints[i + 1])
+
+                # Copies over the settings from the first checkpoint
+                if avg_state is None:
+                    avg_state = state
+
+                model_params = state['model']
+
+                model_params_keys = list(model_params.keys())
+                if params_keys is None:
+                    params_keys = model_params_keys
+                elif params_keys != model_params_keys:
+                    raise KeyError(
+                        'For checkpoint {}, expected list of params: {}, '
+                        'but found: {}'.format(f, params_keys, model_params_keys)
+                    )
+
+                for k in params_keys:
+                    p = model_params[k]
+                    if isinstance(p, torch.HalfTensor):
+                        p = p.float()
+                    if k in params_dict:
+                        params_dict[k].add_(p)
+                    else:
+                        params_dict[k] = p.clone()
+        finally:
+            executor.shutdown()
 
         averaged_params = collections.OrderedDict()
-        # v should be a list of torch Tensor.
-        for k, v in params_dict.items():
-            summed_v = None
-            for x in v:
-                summed_v = summed_v + x if summed_v is not None else x
-            averaged_params[k] = summed_v / len(v)
+        # params_dict holds the running sum over all checkpoints; the average is stored in half
+        # precision to halve the model size on disk and is restored to FP32 when loaded.
+        for k, summed_v in params_dict.items():
+            avg = summed_v / len(checkpoints)
+            averaged_params[k] = avg.half() if avg.is_floating_point() else avg
 
         avg_state['model'] = averaged_params
         avg_state['decode_stats'] = decode_lengths
@@ -252,8 +274,6 @@ def parse_extra_argv(parser, extra_argv):
         cmd_extra_args.extend(['--arch', 'transformer_mmt_base'])
     if not argv_has(cmd_extra_args, '--clip-norm'):
         cmd_extra_args.extend(['--clip-norm', '0.0'])
-    if not argv_has(cmd_extra_args, '--label-smoothing'):
-        cmd_extra_args.extend(['--label-smoothing', '0.1'])
     if not argv_has(cmd_extra_args, '--attention-dropout'):
         cmd_extra_args.extend(['--attention-dropout', '0.1'])
     if not argv_has(cmd_extra_args, '--dropout'):
@@ -261,7 +281,23 @@ def parse_extra_argv(parser, extra_argv):
     if not argv_has(cmd_extra_args, '--wd', '--weight-decay'):
         cmd_extra_args.extend(['--weight-decay', '0.0'])
     if not argv_has(cmd_extra_args, '--criterion'):
-        cmd_extra_args.extend(['--criterion', 'label_smoothed_cross_entropy'])
+        if argv_has(cmd_extra_args, '--adaptive-softmax-cutoff'):
+            # the adaptive softmax computes its own loss and requires the matching fairseq criterion
+            cmd_extra_args.extend(['--criterion', 'adaptive_loss'])
+        else:
+            cmd_extra_args.extend(['--criterion', 'label_smoothed_cross_entropy'])
+
+    criterion = argv_valueof(cmd_extra_args, '--criterion')
+
+    # '--label-smoothing' is registered by label_smoothed_cross_entropy only
+    if criterion == 'label_smoothed_cross_entropy' and not argv_has(cmd_extra_args, '--label-smoothing'):
+        cmd_extra_args.extend(['--label-smoothing', '0.1'])
+
+    if not argv_has(cmd_extra_args, '--ddp-backend'):
+        # adaptive_loss refuses to run under the c10d backend
+        cmd_extra_args.extend(['--ddp-backend', 'no_c10d' if criterion == 'adaptive_loss' else 'c10d'])
+    if not argv_has(cmd_extra_args, '--bucket-cap-mb'):
+        cmd_extra_args.extend(['--bucket-cap-mb', '25'])
 
     if not argv_has(cmd_extra_args, '--optimizer'):
         cmd_extra_args.extend(['--optimizer', 'adam'])
@@ -286,6 +322,8 @@ def parse_extra_argv(parser, extra_argv):
         cmd_extra_args.extend(['--max-tokens', '3072'])
     if not argv_has(cmd_extra_args, '--update-freq'):
         cmd_extra_args.extend(['--update-freq', '4'])
+    if not argv_has(cmd_extra_args, '--num-workers'):
+        cmd_extra_args.extend(['--num-workers', '4'])
 
     if not argv_has(cmd_extra_args, '--save-interval-updates'):
         cmd_extra_args.extend(['--save-interval-updates', '1000'])
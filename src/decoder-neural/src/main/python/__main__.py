@@ -14,6 +14,8 @@ def main(argv=None):
     parser.add_argument('-l', '--log-level', dest='log_level', metavar='LEVEL', help='select the log level',
                         choices=['critical', 'error', 'warning', 'info', 'debug'], default='info')
     parser.add_argument('-g', '--gpu', dest='gpu', help='specify the GPU to use (default none)', default=None, type=int)
+    parser.add_argument('--fp16', dest='fp16', action='store_true', default=False,
+                        help='run the model in half precision (requires a GPU)')
 
     args = parser.parse_args(argv)
 
@@ -35,7 +37,8 @@ def main(argv=None):
             builder.register(name, checkpoint_path)
         checkpoints = builder.build(args.gpu)
 
-        decoder = MMTDecoder(checkpoints, device=args.gpu, tuning_ops=config.tuning)
+        decoder = MMTDecoder(checkpoints, device=args.gpu, use_fp16=args.fp16 and args.gpu is not None,
+                             tuning_ops=config.tuning)
     except Exception as e:
         stdout.write('ERROR: %s\n' % str(e))
         stdout.flush()
@@ -95,16 +95,14 @@ def make_alignment(source_indexes, target_indexes, attention_matrix, prefix_lang
     t_len = alignment_matrix.shape[1]
 
     # select points of the direct alignment (having score >= threshold*best)
-    t2s_sub_alignment = []
-    for t in range(t_len):
-        threshold_value = threshold * norm_axis1[t2s_best_indexes[t], t]
-        t2s_sub_alignment += [(s, t) for s in range(s_len) if norm_axis1[s, t] >= threshold_value]
+    t2s_thresholds = threshold * norm_axis1[t2s_best_indexes, np.arange(t_len)]
+    t2s_points_s, t2s_points_t = np.nonzero(norm_axis1 >= t2s_thresholds[np.newaxis, :])
+    t2s_sub_alignment = list(zip(t2s_points_s.tolist(), t2s_points_t.tolist()))
 
     # select points of the inverted alignment (having score >= threshold*best)
-    s2t_sub_alignment = []
-    for s in range(s_len):
-        threshold_value = threshold * norm_axis0[s, s2t_best_indexes[s]]
-        s2t_sub_alignment += [(s, t) for t in range(t_len) if norm_axis0[s, t] >= threshold_value]
+    s2t_thresholds = threshold * norm_axis0[np.arange(s_len), s2t_best_indexes]
+    s2t_points_s, s2t_points_t = np.nonzero(norm_axis0 >= s2t_thresholds[:, np.newaxis])
+    s2t_sub_alignment = list(zip(s2t_points_s.tolist(), s2t_points_t.tolist()))
 
     if not t2s_sub_alignment and not s2t_sub_alignment:
         return []
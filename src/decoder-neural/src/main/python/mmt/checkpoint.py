@@ -54,7 +54,7 @@ class Checkpoint(object):
     def decode_length(self, source_lang, target_lang, source_length):
         lang_key = '%s__%s' % (source_lang, target_lang)
         if lang_key not in self._decode_stats:
-            self._logger.warning('No decoding stats found for key "%s"' % lang_key)
+            self._logger.warning('No decoding stats found for key "%s"', lang_key)
             avg, std_dev = 2, 0
         else:
             avg, std_dev = self._decode_stats[lang_key]
@@ -130,6 +130,11 @@ class CheckpointRegistry(object):
             args, model_state, decode_stats = model_pt['args'], model_pt['model'], \
                                               model_pt['decode_stats'] if 'decode_stats' in model_pt else None
 
+            # Restore FP32 weights (averaged models are stored in half precision to save disk space)
+            for key, tensor in model_state.items():
+                if tensor.dtype == torch.float16:
+                    model_state[key] = tensor.float()
+
             # Resize embeddings
             if embeddings_size is not None and model_state['encoder.embed_tokens.weight'].shape[0] < embeddings_size:
                 model_state['encoder.embed_tokens.weight'] = \
@@ -159,7 +159,7 @@ class MMTDecoder(object):
         self._translator.generate([self._model], test_batch)
         test_time = time.time() - begin
 
-        self._logger.info('test_time = %.3f' % test_time)
+        self._logger.info('test_time = %.3f', test_time)
 
     def translate(self, source_lang, target_lang, batch, suggestions=None,
                   tuning_epochs=None, tuning_learning_rate=None, forced_translation=None):
@@ -183,8 +183,8 @@ class MMTDecoder(object):
 
         decode_time = time.time() - begin
 
-        self._logger.info('reset_time = %.3f, tune_time = %.3f, decode_time = %.3f'
-                          % (reset_time, tune_time, decode_time))
+        self._logger.info('reset_time = %.3f, tune_time = %.3f, decode_time = %.3f',
+                          reset_time, tune_time, decode_time)
 
         return result
 
@@ -235,7 +235,7 @@ class MMTDecoder(object):
         for i, hypo in enumerate(translations):
             hypo = hypo[0]  # (top-1 best nbest)
             hypo_score = math.exp(hypo['score'])
-            hypo_tokens = hypo['tokens']
+            hypo_tokens = hypo['tokens'].cpu()
             hypo_indexes = sub_dict.indexes_of(hypo_tokens)
             hypo_str = sub_dict.string(hypo_tokens)
             hypo_attention = np.asarray(hypo['attention'].data.cpu())
@@ -263,19 +263,17 @@ class MMTDecoder(object):
         tgt_indexes = batch['trg_indexes']
         src_lengths = batch['src_lengths']
 
-        if self._device is not None:
-            src_tokens = src_tokens.cuda(self._device)
-            src_lengths = src_lengths.cuda(self._device)
-            tgt_tokens = tgt_tokens.cuda(self._device)
-
         self._model.eval()
-        _, attn = self._model(src_tokens, src_lengths, tgt_tokens)
+        with torch.no_grad():
+            _, attn = self._model(src_tokens, src_lengths, tgt_tokens)
         if type(attn) is dict:
             attn = attn['attn']
 
+        attn = attn.cpu()  # single device-to-host transfer for the whole batch
+
         results = []
         for i, hypo_attention in enumerate(attn):  # for each entry of the original batch
-            hypo_attention = hypo_attention.transpose(0, 1).cpu()
+            hypo_attention = hypo_attention.transpose(0, 1)
             hypo_attention = hypo_attention[hypo_attention.size(0) - (len(src_indexes[i]) + 1):,
                              hypo_attention.size(1) - (len(tgt_indexes[i]) + 1):]
 
@@ -334,22 +332,19 @@ class MMTDecoder(object):
             indexes = [[]]
             lengths = torch.LongTensor([1])
 
-        max_length = torch.max(lengths)
+        max_length = int(torch.max(lengths))
 
-        # Apply padding
+        # Apply left-side padding, writing all entries into a single pre-allocated batch tensor
         if len(entries) > 1:
-            tokens = [torch.nn.functional.pad(el, (max_length - el.size(0), 0), value=sub_dict.pad()) for el in tokens]
-
-        # Reshape tokens tensor
-        if len(entries) > 1:
-            tokens = torch.cat(tokens)
+            batch_tokens = tokens[0].new_full((len(entries), max_length), sub_dict.pad())
+            for i, el in enumerate(tokens):
+                batch_tokens[i, max_length - el.size(0):] = el
+            tokens = batch_tokens
         else:
-            tokens = tokens[0]
-
-        tokens = tokens.reshape([max(1, len(entries)), max_length])
+            tokens = tokens[0].reshape([1, max_length])
 
         if self._device is not None:
-            tokens = tokens.cuda(self._device)
-            lengths = lengths.cuda(self._device)
+            tokens = tokens.pin_memory().cuda(self._device, non_blocking=True)
+            lengths = lengths.pin_memory().cuda(self._device, non_blocking=True)
 
         return tokens, indexes, lengths, max_length
@@ -14,6 +14,7 @@ class TuningOptions(object):
         self.tuning_max_epochs = 4
         self.tuning_max_learning_rate = .0001
         self.tuning_max_batch_size = 4000
+        self.tuning_grad_accum_steps = 1
 
     def __str__(self):
         return str(self.__dict__)
@@ -71,13 +72,15 @@ class Tuner(object):
         self._task = task
 
         self._model = model
+        # the set of trainable parameters is fixed for the lifetime of the model
+        self._params = [p for p in model.parameters() if p.requires_grad]
 
         self._criterion = task.build_criterion(args)
         if self._cuda:
             self._criterion = self._criterion.cuda()
 
     def _build_optimizer(self):
-        params = list(filter(lambda p: p.requires_grad, self._model.parameters()))
+        params = self._params
         if self._args.fp16:
             if self._cuda and torch.cuda.get_device_capability(0)[0] < 7:
                 print('| WARNING: your device does NOT support faster training with --fp16, '
@@ -128,19 +131,28 @@ class Tuner(object):
         )
 
         optimizer = self._build_optimizer()
+        optimizer.set_lr(lr)
+        accum_steps = max(1, self._tuning_ops.tuning_grad_accum_steps)
 
         for step in range(num_iterations):
+            samples = []
+
             for sample in epoch_itr.next_epoch_itr(shuffle=False, fix_batches_to_gpus=False):
                 if len(sample) == 0:
                     continue
 
-                sample = utils.move_to_cuda(sample)
-                optimizer.set_lr(lr)
-                self._train_step(optimizer, sample, step)
-                del sample
+                samples.append(utils.move_to_cuda(sample))
+
+                if len(samples) == accum_steps:
+                    self._train_step(optimizer, samples, step)
+                    del samples[:]
 
-    def _train_step(self, optimizer, sample, step=0):
-        """Do forward, backward and parameter update."""
+            if len(samples) > 0:
+                self._train_step(optimizer, samples, step)
+                del samples[:]
+
+    def _train_step(self, optimizer, samples, step=0):
+        """Do forward and backward on each accumulated sample, then a single parameter update."""
         seed = self._args.seed + step
         torch.manual_seed(seed)
         if self._cuda:
@@ -153,8 +165,12 @@ class Tuner(object):
         self._model.accumulate_grads = False
 
         try:
-            # forward and backward
-            self._task.train_step(sample, self._model, self._criterion, optimizer, ignore_grad=False)
+            # forward and backward, accumulating gradients across samples
+            for sample in samples:
+                self._task.train_step(sample, self._model, self._criterion, optimizer, ignore_grad=False)
+
+            if len(samples) > 1:
+                optimizer.multiply_grads(1. / len(samples))
         except RuntimeError as e:
             if 'out of memory' in str(e):
                 self._logger.warning('ran out of memory, skipping batch')